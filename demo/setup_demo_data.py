@@ -4,7 +4,8 @@ Generate realistic sample analytics data and load it into DuckDB.
 
 Usage:
     pip install duckdb
-    python setup_demo_data.py
+    python setup_demo_data.py            # skips work if the database is already loaded
+    python setup_demo_data.py --force    # always regenerate
 
 Creates demo/data/analytics_demo.duckdb with four tables:
   - customers  (~2,000 rows)
@@ -12,14 +13,19 @@ Creates demo/data/analytics_demo.duckdb with four tables:
   - orders     (~10,000 rows)
   - events     (~50,000 rows)
 
-Idempotent — drops and recreates tables on every run.
+Idempotent — if the database already holds a complete load it is left as is;
+otherwise (or with --force) all tables are dropped and recreated.
 """
 
+import argparse
+import csv
 import duckdb
 import random
-import hashlib
 import os
+import tempfile
 from datetime import datetime, timedelta
+from itertools import accumulate, islice
+from operator import sub
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -32,9 +38,56 @@ DATE_END = datetime(2025, 12, 31)
 NUM_CUSTOMERS = 2000
 NUM_PRODUCTS = 200
 NUM_ORDERS = 10000
+NUM_DUPLICATE_ORDERS = 5
 NUM_EVENTS = 50000
 
-random.seed(SEED)
+# Column names and DuckDB types for each table, in DDL order. Used both to create
+# the tables and to check whether an existing database matches this script.
+TABLE_SCHEMAS = {
+    "customers": [
+        ("customer_id", "INTEGER"),
+        ("name", "VARCHAR"),
+        ("email", "VARCHAR"),
+        ("city", "VARCHAR"),
+        ("signup_date", "DATE"),
+        ("segment", "VARCHAR"),
+    ],
+    "products": [
+        ("product_id", "INTEGER"),
+        ("name", "VARCHAR"),
+        ("category", "VARCHAR"),
+        ("subcategory", "VARCHAR"),
+        ("cost_price", "DECIMAL(10,2)"),
+        ("list_price", "DECIMAL(10,2)"),
+    ],
+    "orders": [
+        ("order_id", "INTEGER"),
+        ("customer_id", "INTEGER"),
+        ("order_date", "DATE"),
+        ("product_id", "INTEGER"),
+        ("quantity", "INTEGER"),
+        ("unit_price", "DECIMAL(10,2)"),
+        ("total_amount", "DECIMAL(10,2)"),
+        ("status", "VARCHAR"),
+        ("payment_method", "VARCHAR"),
+    ],
+    "events": [
+        ("event_id", "INTEGER"),
+        ("customer_id", "INTEGER"),
+        ("event_type", "VARCHAR"),
+        ("event_date", "TIMESTAMP"),
+        ("session_id", "VARCHAR"),
+        ("device_type", "VARCHAR"),
+    ],
+}
+PRIMARY_KEYS = {"customers": "customer_id", "products": "product_id"}
+
+# Each table draws from its own generator seeded at SEED + task_id * 1000, so its
+# data is deterministic regardless of the order (or concurrency) tables are built in
+TABLE_SEEDS = {
+    table: SEED + task_id * 1000
+    for task_id, table in enumerate(["customers", "products", "orders", "events"])
+}
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -74,6 +127,7 @@ CITIES = [
 
 SEGMENTS = ["enterprise", "mid-market", "smb"]
 SEGMENT_WEIGHTS = [0.15, 0.30, 0.55]
+SEGMENT_CUM_WEIGHTS = list(accumulate(SEGMENT_WEIGHTS))
 
 CATEGORIES = {
     "Electronics": ["Laptops", "Phones", "Tablets", "Accessories", "Audio"],
@@ -84,178 +138,289 @@ CATEGORIES = {
 
 PAYMENT_METHODS = ["credit_card", "debit_card", "paypal", "wire_transfer"]
 PAYMENT_WEIGHTS = [0.45, 0.25, 0.20, 0.10]
+PAYMENT_CUM_WEIGHTS = list(accumulate(PAYMENT_WEIGHTS))
 
 DEVICE_TYPES = ["desktop", "mobile", "tablet"]
 DEVICE_WEIGHTS = [0.40, 0.45, 0.15]
+DEVICE_CUM_WEIGHTS = list(accumulate(DEVICE_WEIGHTS))
+
+# A session stops at step i of the funnel with probability FUNNEL_DEPTH_WEIGHTS[i]:
+# 30% of page_views add to cart, 50% of those start checkout, 70% of those purchase
+FUNNEL_STEPS = ["page_view", "add_to_cart", "checkout_start", "purchase"]
+FUNNEL_DEPTH_WEIGHTS = [0.70, 0.30 * 0.50, 0.30 * 0.50 * 0.30, 0.30 * 0.50 * 0.70]
+FUNNEL_DEPTH_CUM_WEIGHTS = list(accumulate(FUNNEL_DEPTH_WEIGHTS))
+
+# ~15% cancelled/returned
+ORDER_STATUSES = ["cancelled", "returned", "completed"]
+ORDER_STATUS_WEIGHTS = [0.10, 0.05, 0.85]
+ORDER_STATUS_CUM_WEIGHTS = list(accumulate(ORDER_STATUS_WEIGHTS))
+
+QUANTITIES = [1, 2, 3, 4, 5]
+QUANTITY_WEIGHTS = [50, 25, 15, 7, 3]
+QUANTITY_CUM_WEIGHTS = list(accumulate(QUANTITY_WEIGHTS))
 
+EMAIL_DOMAINS = ["gmail.com", "yahoo.com", "outlook.com", "company.io", "mail.com"]
 
-def random_date(start, end):
-    delta = (end - start).days
-    return start + timedelta(days=random.randint(0, delta))
 
+def date_range(start, end):
+    """Return every day from start to end, inclusive, as the same type as start."""
+    return [start + timedelta(days=d) for d in range((end - start).days + 1)]
 
-def seasonal_date(start, end):
-    """Return a random date biased by seasonal revenue patterns."""
-    d = random_date(start, end)
-    month = d.month
-    # Q4 spike: accept Q4 dates more often; Q1 dip: reject some Q1 dates
-    if month in (10, 11, 12):
-        return d  # always accept Q4
-    if month in (1, 2, 3) and random.random() < 0.30:
-        return seasonal_date(start, end)  # retry — creates Q1 dip
-    return d
 
+def random_dates(rng, start, end, k):
+    """Return k uniformly random dates between start and end, drawn in one call."""
+    return rng.choices(date_range(start, end), k=k)
 
-def pareto_choice(items, alpha=1.5):
-    """Pick from items with a Pareto-like distribution favoring early indices."""
-    idx = int(random.paretovariate(alpha)) % len(items)
-    return items[idx]
 
+def seasonal_dates(rng, start, end, k):
+    """Return k random dates biased by seasonal revenue patterns.
 
-def make_email(first, last, idx):
-    tag = hashlib.md5(f"{first}{last}{idx}".encode()).hexdigest()[:4]
-    domain = random.choice(["gmail.com", "yahoo.com", "outlook.com", "company.io", "mail.com"])
-    return f"{first.lower()}.{last.lower()}{tag}@{domain}"
+    Draws candidates in bulk and rejects some Q1 dates, oversampling so a
+    single pass almost always yields k survivors.
+    """
+    calendar = date_range(start, end)
+    dates = []
+    while len(dates) < k:
+        draws = rng.choices(calendar, k=int((k - len(dates)) * 1.2) + 1)
+        # Q4 spike: accept Q4 dates more often; Q1 dip: reject some Q1 dates
+        dates.extend(d for d in draws if d.month > 3 or rng.random() >= 0.30)
+    return dates[:k]
+
+
+def pareto_choices(rng, items, k, alpha=1.5, wraps=20):
+    """Pick k items with a Pareto-like distribution favoring early indices.
+
+    Equivalent to k draws of items[int(paretovariate(alpha)) % len(items)], but
+    the index distribution is computed once and sampled in a single call.
+    P(int(X) = m) = m**-alpha - (m + 1)**-alpha, folded modulo len(items) over
+    the first `wraps` passes; the truncated tail has mass (wraps * n)**-alpha.
+    """
+    n = len(items)
+    survival = [m ** -alpha for m in range(1, wraps * n + 2)]
+    pmf = list(map(sub, survival, survival[1:]))  # pmf[i] = P(int(X) = i + 1)
+    weights = [sum(pmf[(idx - 1) % n::n]) for idx in range(n)]
+    return rng.choices(items, weights=weights, k=k)
+
+
+def make_email(first, last, idx, domain):
+    # idx is unique per customer, so its hex form works as a collision-free tag
+    return f"{first.lower()}.{last.lower()}{idx:04x}@{domain}"
 
 
 # ---------------------------------------------------------------------------
 # Data generation
 # ---------------------------------------------------------------------------
 def generate_customers():
-    rows = []
-    for i in range(1, NUM_CUSTOMERS + 1):
-        first = random.choice(FIRST_NAMES)
-        last = random.choice(LAST_NAMES)
-        name = f"{first} {last}"
-        email = make_email(first, last, i)
-        # Plant data quality issue: ~3% null cities
-        city = random.choice(CITIES) if random.random() > 0.03 else None
-        signup_date = random_date(DATE_START, DATE_END).strftime("%Y-%m-%d")
-        segment = random.choices(SEGMENTS, weights=SEGMENT_WEIGHTS, k=1)[0]
-        rows.append((i, name, email, city, signup_date, segment))
-    return rows
+    rng = random.Random(TABLE_SEEDS["customers"])
+    ids = list(range(1, NUM_CUSTOMERS + 1))
+    firsts = rng.choices(FIRST_NAMES, k=NUM_CUSTOMERS)
+    lasts = rng.choices(LAST_NAMES, k=NUM_CUSTOMERS)
+    domains = rng.choices(EMAIL_DOMAINS, k=NUM_CUSTOMERS)
+    # Plant data quality issue: ~3% null cities
+    cities = [city if rng.random() > 0.03 else None for city in rng.choices(CITIES, k=NUM_CUSTOMERS)]
+    signup_dates = random_dates(rng, DATE_START.date(), DATE_END.date(), NUM_CUSTOMERS)
+    return {
+        "customer_id": ids,
+        "name": [f"{first} {last}" for first, last in zip(firsts, lasts)],
+        "email": [make_email(*args) for args in zip(firsts, lasts, ids, domains)],
+        "city": cities,
+        "signup_date": signup_dates,
+        "segment": rng.choices(SEGMENTS, cum_weights=SEGMENT_CUM_WEIGHTS, k=NUM_CUSTOMERS),
+    }
 
 
 def generate_products():
-    rows = []
+    rng = random.Random(TABLE_SEEDS["products"])
+    ids = list(range(1, NUM_PRODUCTS + 1))
+    # Every product_id in 1..NUM_PRODUCTS is filled below, so size the columns up front
+    names, categories, subcategories, cost_prices, list_prices = ([None] * NUM_PRODUCTS for _ in range(5))
     pid = 1
     adjectives = ["Pro", "Ultra", "Basic", "Premium", "Lite", "Max", "Classic", "Elite", "Essential", "Advanced"]
     for category, subcats in CATEGORIES.items():
         per_subcat = NUM_PRODUCTS // (len(CATEGORIES) * len(subcats))
         for subcat in subcats:
             for _ in range(per_subcat):
-                adj = random.choice(adjectives)
-                name = f"{adj} {subcat.rstrip('s')} {pid}"
-                cost = round(random.uniform(5, 200), 2)
+                adj = rng.choice(adjectives)
+                cost = round(rng.uniform(5, 200), 2)
                 # Plant data quality issue: ~3% of products have list_price < cost_price
-                if random.random() < 0.03:
-                    list_price = round(cost * random.uniform(0.5, 0.9), 2)
+                if rng.random() < 0.03:
+                    list_price = round(cost * rng.uniform(0.5, 0.9), 2)
                 else:
-                    list_price = round(cost * random.uniform(1.2, 3.0), 2)
-                rows.append((pid, name, category, subcat, cost, list_price))
+                    list_price = round(cost * rng.uniform(1.2, 3.0), 2)
+                i = pid - 1
+                names[i] = f"{adj} {subcat.rstrip('s')} {pid}"
+                categories[i] = category
+                subcategories[i] = subcat
+                cost_prices[i] = cost
+                list_prices[i] = list_price
                 pid += 1
     # Fill remaining to hit ~200
-    while len(rows) < NUM_PRODUCTS:
-        cat = random.choice(list(CATEGORIES.keys()))
-        subcat = random.choice(CATEGORIES[cat])
-        adj = random.choice(adjectives)
-        name = f"{adj} {subcat.rstrip('s')} {pid}"
-        cost = round(random.uniform(5, 200), 2)
-        list_price = round(cost * random.uniform(1.2, 3.0), 2)
-        rows.append((pid, name, cat, subcat, cost, list_price))
+    category_names = list(CATEGORIES)
+    while pid <= NUM_PRODUCTS:
+        cat = rng.choice(category_names)
+        subcat = rng.choice(CATEGORIES[cat])
+        adj = rng.choice(adjectives)
+        cost = round(rng.uniform(5, 200), 2)
+        i = pid - 1
+        names[i] = f"{adj} {subcat.rstrip('s')} {pid}"
+        categories[i] = cat
+        subcategories[i] = subcat
+        cost_prices[i] = cost
+        list_prices[i] = round(cost * rng.uniform(1.2, 3.0), 2)
         pid += 1
-    return rows
+    return {
+        "product_id": ids,
+        "name": names,
+        "category": categories,
+        "subcategory": subcategories,
+        "cost_price": cost_prices,
+        "list_price": list_prices,
+    }
 
 
 def generate_orders(customers, products):
-    rows = []
-    customer_ids = [c[0] for c in customers]
-    product_ids = [p[0] for p in products]
-    product_prices = {p[0]: p[5] for p in products}  # list_price
-
-    duplicate_target = random.randint(8050, 8150)  # plant a few duplicate order_ids
-
-    for i in range(1, NUM_ORDERS + 1):
-        cid = pareto_choice(customer_ids, alpha=1.2)
-        pid = random.choice(product_ids)
-        order_date = seasonal_date(DATE_START, DATE_END).strftime("%Y-%m-%d")
-        quantity = random.choices([1, 2, 3, 4, 5], weights=[50, 25, 15, 7, 3], k=1)[0]
-        unit_price = product_prices[pid]
-        total = round(unit_price * quantity, 2)
-
-        # ~15% cancelled/returned
-        r = random.random()
-        if r < 0.10:
-            status = "cancelled"
-        elif r < 0.15:
-            status = "returned"
-        else:
-            status = "completed"
-
-        pm = random.choices(PAYMENT_METHODS, weights=PAYMENT_WEIGHTS, k=1)[0]
-        rows.append((i, cid, order_date, pid, quantity, unit_price, total, status, pm))
+    rng = random.Random(TABLE_SEEDS["orders"])
+    customer_ids = customers["customer_id"]
+    product_ids = products["product_id"]
+    list_prices = products["list_price"]
+
+    duplicate_target = rng.randint(8050, 8150)  # plant a few duplicate order_ids
+
+    # Draw product row positions so id and price are gathered by index, not looked up
+    product_rows = rng.choices(range(len(product_ids)), k=NUM_ORDERS)
+    pids = [product_ids[i] for i in product_rows]
+    unit_prices = [list_prices[i] for i in product_rows]
+    quantities = rng.choices(QUANTITIES, cum_weights=QUANTITY_CUM_WEIGHTS, k=NUM_ORDERS)
+    orders = {
+        "order_id": list(range(1, NUM_ORDERS + 1)),
+        "customer_id": pareto_choices(rng, customer_ids, NUM_ORDERS, alpha=1.2),
+        "order_date": seasonal_dates(rng, DATE_START.date(), DATE_END.date(), NUM_ORDERS),
+        "product_id": pids,
+        "quantity": quantities,
+        "unit_price": unit_prices,
+        "total_amount": [round(price * qty, 2) for price, qty in zip(unit_prices, quantities)],
+        "status": rng.choices(ORDER_STATUSES, cum_weights=ORDER_STATUS_CUM_WEIGHTS, k=NUM_ORDERS),
+        "payment_method": rng.choices(PAYMENT_METHODS, cum_weights=PAYMENT_CUM_WEIGHTS, k=NUM_ORDERS),
+    }
 
     # Plant data quality issue: duplicate a few orders with the same order_id
-    for dup_offset in range(5):
-        src = rows[duplicate_target + dup_offset]
-        rows.append(src)  # exact duplicate row
+    for col in orders.values():
+        col.extend(col[duplicate_target:duplicate_target + NUM_DUPLICATE_ORDERS])  # exact duplicate rows
 
-    return rows
+    return orders
 
 
 def generate_events(customers):
-    rows = []
-    customer_ids = [c[0] for c in customers]
-    eid = 1
-    session_counter = 1
-
-    while eid <= NUM_EVENTS:
-        cid = pareto_choice(customer_ids, alpha=1.2)
-        device = random.choices(DEVICE_TYPES, weights=DEVICE_WEIGHTS, k=1)[0]
-        session_id = f"sess_{session_counter:06d}"
-        session_counter += 1
-        base_date = random_date(DATE_START, DATE_END)
-
-        # Simulate a funnel within this session
-        # page_view always happens
-        rows.append((eid, cid, "page_view", base_date.strftime("%Y-%m-%d %H:%M:%S"), session_id, device))
-        eid += 1
-        if eid > NUM_EVENTS:
-            break
-
-        # add_to_cart: 30% of page_views
-        if random.random() < 0.30:
-            ts = (base_date + timedelta(minutes=random.randint(1, 10))).strftime("%Y-%m-%d %H:%M:%S")
-            rows.append((eid, cid, "add_to_cart", ts, session_id, device))
-            eid += 1
-            if eid > NUM_EVENTS:
-                break
-
-            # checkout_start: 50% of add_to_carts
-            if random.random() < 0.50:
-                ts = (base_date + timedelta(minutes=random.randint(11, 20))).strftime("%Y-%m-%d %H:%M:%S")
-                rows.append((eid, cid, "checkout_start", ts, session_id, device))
-                eid += 1
-                if eid > NUM_EVENTS:
-                    break
-
-                # purchase: 70% of checkouts
-                if random.random() < 0.70:
-                    ts = (base_date + timedelta(minutes=random.randint(21, 30))).strftime("%Y-%m-%d %H:%M:%S")
-                    rows.append((eid, cid, "purchase", ts, session_id, device))
-                    eid += 1
-                    if eid > NUM_EVENTS:
-                        break
-
-    return rows
+    rng = random.Random(TABLE_SEEDS["events"])
+    customer_ids = customers["customer_id"]
+
+    # Every session emits at least one event, so NUM_EVENTS bounds the session count
+    session_cids = pareto_choices(rng, customer_ids, NUM_EVENTS, alpha=1.2)
+    session_devices = rng.choices(DEVICE_TYPES, cum_weights=DEVICE_CUM_WEIGHTS, k=NUM_EVENTS)
+    session_dates = random_dates(rng, DATE_START, DATE_END, NUM_EVENTS)
+
+    # Draw how deep each session gets into the funnel, then flatten sessions into
+    # (session index, funnel step) events until NUM_EVENTS is reached
+    depths = rng.choices(range(1, len(FUNNEL_STEPS) + 1), cum_weights=FUNNEL_DEPTH_CUM_WEIGHTS, k=NUM_EVENTS)
+    flat = islice(((s, step) for s, depth in enumerate(depths) for step in range(depth)), NUM_EVENTS)
+    sessions, steps = map(list, zip(*flat))
+
+    # page_view at the session start, then each later step 1-10 minutes into its own 10-minute window.
+    # Offsets stay integer minutes and index a shared table of timedeltas, so no
+    # timedelta is created per event.
+    minutes = rng.choices(range(1, 11), k=len(steps))
+    offsets = [10 * (step - 1) + m if step else 0 for step, m in zip(steps, minutes)]
+    deltas = [timedelta(minutes=m) for m in range(10 * (len(FUNNEL_STEPS) - 1) + 1)]
+    timestamps = [session_dates[s] + deltas[offset] for s, offset in zip(sessions, offsets)]
+
+    return {
+        "event_id": list(range(1, len(sessions) + 1)),
+        "customer_id": [session_cids[s] for s in sessions],
+        "event_type": [FUNNEL_STEPS[step] for step in steps],
+        "event_date": timestamps,
+        "session_id": [f"sess_{s + 1:06d}" for s in sessions],
+        "device_type": [session_devices[s] for s in sessions],
+    }
 
 
 # ---------------------------------------------------------------------------
 # Load into DuckDB
 # ---------------------------------------------------------------------------
-def load_data():
+def insert_columns(con, table, columns):
+    """Bulk-load a {column_name: values} mapping via a temporary CSV file.
+
+    COPY ... FROM is DuckDB's fast native ingest path: the file is parsed and
+    cast to the table's column types in bulk, with no per-row Python round-trip.
+    The dialect is fixed by csv.writer and the types by the table, so the CSV
+    sniffer is disabled. None values are written as empty fields, which COPY
+    reads back as NULL, and dates/datetimes go through str(), which already
+    yields the ISO text DATE and TIMESTAMP columns parse.
+    """
+    fd, path = tempfile.mkstemp(prefix=f"{table}_", suffix=".csv")
+    try:
+        with os.fdopen(fd, "w", newline="") as f:
+            csv.writer(f).writerows(zip(*columns.values()))
+        names = ", ".join(columns)
+        quoted_path = path.replace("'", "''")
+        options = "FORMAT CSV, HEADER false, AUTO_DETECT false, DELIMITER ',', QUOTE '\"'"
+        con.execute(f"COPY {table} ({names}) FROM '{quoted_path}' ({options})")
+    finally:
+        os.remove(path)
+
+
+def is_loaded():
+    """Return True if DB_PATH already holds a complete load matching this script.
+
+    The four tables must have exactly the columns, types and primary keys in
+    TABLE_SCHEMAS / PRIMARY_KEYS, and their expected row counts.
+    """
+    if not os.path.exists(DB_PATH):
+        return False
+    expected_counts = {
+        "customers": NUM_CUSTOMERS,
+        "products": NUM_PRODUCTS,
+        "orders": NUM_ORDERS + NUM_DUPLICATE_ORDERS,
+        "events": NUM_EVENTS,
+    }
+    con = duckdb.connect(DB_PATH, read_only=True)
+    try:
+        schemas = {}
+        for table, column, data_type in con.execute("""
+            SELECT table_name, column_name, data_type
+            FROM information_schema.columns
+            WHERE table_schema = 'main'
+            ORDER BY table_name, ordinal_position
+        """).fetchall():
+            schemas.setdefault(table, []).append((column, data_type))
+        if any(schemas.get(table) != columns for table, columns in TABLE_SCHEMAS.items()):
+            return False
+
+        primary_keys = {
+            table: columns
+            for table, columns in con.execute("""
+                SELECT table_name, constraint_column_names
+                FROM duckdb_constraints()
+                WHERE schema_name = 'main' AND constraint_type = 'PRIMARY KEY'
+            """).fetchall()
+            if table in TABLE_SCHEMAS
+        }
+        if primary_keys != {table: [column] for table, column in PRIMARY_KEYS.items()}:
+            return False
+
+        counts = {table: con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in expected_counts}
+    finally:
+        con.close()
+    return counts == expected_counts
+
+
+def load_data(force=False):
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 
+    if not force and is_loaded():
+        print(f"Demo database already loaded at {DB_PATH}")
+        print("Run with --force to regenerate it.")
+        return
+
     print("Generating sample data...")
     customers = generate_customers()
     products = generate_products()
@@ -265,111 +430,106 @@ def load_data():
     print(f"Connecting to {DB_PATH}")
     con = duckdb.connect(DB_PATH)
 
+    # Rebuild everything in one transaction: a single commit for the whole load,
+    # and an interrupted run leaves the previous tables intact
+    con.execute("BEGIN TRANSACTION")
+
     # Drop existing tables
     for table in ["events", "orders", "products", "customers"]:
         con.execute(f"DROP TABLE IF EXISTS {table}")
 
     # Create tables
-    con.execute("""
-        CREATE TABLE customers (
-            customer_id INTEGER PRIMARY KEY,
-            name VARCHAR,
-            email VARCHAR,
-            city VARCHAR,
-            signup_date DATE,
-            segment VARCHAR
-        )
-    """)
-    con.execute("""
-        CREATE TABLE products (
-            product_id INTEGER PRIMARY KEY,
-            name VARCHAR,
-            category VARCHAR,
-            subcategory VARCHAR,
-            cost_price DECIMAL(10,2),
-            list_price DECIMAL(10,2)
-        )
-    """)
-    con.execute("""
-        CREATE TABLE orders (
-            order_id INTEGER,
-            customer_id INTEGER,
-            order_date DATE,
-            product_id INTEGER,
-            quantity INTEGER,
-            unit_price DECIMAL(10,2),
-            total_amount DECIMAL(10,2),
-            status VARCHAR,
-            payment_method VARCHAR
+    for table, columns in TABLE_SCHEMAS.items():
+        column_defs = ", ".join(
+            f"{name} {sql_type}" + (" PRIMARY KEY" if PRIMARY_KEYS.get(table) == name else "")
+            for name, sql_type in columns
         )
-    """)
-    con.execute("""
-        CREATE TABLE events (
-            event_id INTEGER,
-            customer_id INTEGER,
-            event_type VARCHAR,
-            event_date TIMESTAMP,
-            session_id VARCHAR,
-            device_type VARCHAR
-        )
-    """)
+        con.execute(f"CREATE TABLE {table} ({column_defs})")
 
     # Insert data
     print("Loading customers...")
-    con.executemany("INSERT INTO customers VALUES (?, ?, ?, ?, ?, ?)", customers)
+    insert_columns(con, "customers", customers)
 
     print("Loading products...")
-    con.executemany("INSERT INTO products VALUES (?, ?, ?, ?, ?, ?)", products)
+    insert_columns(con, "products", products)
 
     print("Loading orders...")
-    con.executemany("INSERT INTO orders VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", orders)
+    insert_columns(con, "orders", orders)
 
     print("Loading events...")
-    con.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?)", events)
+    insert_columns(con, "events", events)
+
+    con.execute("COMMIT")
 
     # Print summary
     print("\n" + "=" * 60)
     print("  DEMO DATABASE READY")
     print("=" * 60)
 
-    for table in ["customers", "products", "orders", "events"]:
-        count = con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    (
+        customer_count, null_cities,
+        product_count, mispriced,
+        order_count, first_order, last_order, rev, cancel_rate, dup_orders,
+        event_count, funnel,
+    ) = con.execute("""
+        WITH customer_stats AS (
+            SELECT
+                COUNT(*) AS row_count,
+                COUNT(*) FILTER (WHERE city IS NULL) AS null_cities,
+            FROM customers
+        ),
+        product_stats AS (
+            SELECT
+                COUNT(*) AS row_count,
+                COUNT(*) FILTER (WHERE list_price < cost_price) AS mispriced,
+            FROM products
+        ),
+        order_stats AS (
+            SELECT
+                COUNT(*) AS row_count,
+                MIN(order_date) AS first_order,
+                MAX(order_date) AS last_order,
+                ROUND(SUM(total_amount) FILTER (WHERE status = 'completed'), 2) AS revenue,
+                ROUND(100.0 * COUNT(*) FILTER (WHERE status != 'completed') / COUNT(*), 1) AS cancel_rate,
+                COUNT(*) - COUNT(DISTINCT order_id) AS dup_orders,
+            FROM orders
+        ),
+        funnel_steps AS (
+            SELECT
+                event_type,
+                COUNT(*) AS cnt,
+            FROM events
+            GROUP BY event_type
+        ),
+        event_stats AS (
+            SELECT
+                SUM(cnt) AS row_count,
+                LIST((event_type, cnt) ORDER BY cnt DESC) AS funnel,
+            FROM funnel_steps
+        )
+        SELECT
+            c.row_count, c.null_cities,
+            p.row_count, p.mispriced,
+            o.row_count, o.first_order, o.last_order, o.revenue, o.cancel_rate, o.dup_orders,
+            e.row_count, e.funnel,
+        FROM customer_stats AS c, product_stats AS p, order_stats AS o, event_stats AS e
+    """).fetchone()
+
+    for table, count in [
+        ("customers", customer_count),
+        ("products", product_count),
+        ("orders", order_count),
+        ("events", event_count),
+    ]:
         print(f"  {table:12s}  {count:>8,} rows")
 
-    date_range = con.execute("SELECT MIN(order_date), MAX(order_date) FROM orders").fetchone()
-    print(f"\n  Order date range: {date_range[0]} to {date_range[1]}")
-
-    rev = con.execute(
-        "SELECT ROUND(SUM(total_amount), 2) FROM orders WHERE status = 'completed'"
-    ).fetchone()[0]
+    print(f"\n  Order date range: {first_order} to {last_order}")
     print(f"  Total completed revenue: ${rev:,.2f}")
-
-    cancel_rate = con.execute(
-        "SELECT ROUND(100.0 * SUM(CASE WHEN status != 'completed' THEN 1 ELSE 0 END) / COUNT(*), 1) FROM orders"
-    ).fetchone()[0]
     print(f"  Cancellation/return rate: {cancel_rate}%")
-
-    null_cities = con.execute(
-        "SELECT COUNT(*) FROM customers WHERE city IS NULL"
-    ).fetchone()[0]
     print(f"  Customers with null city: {null_cities}")
-
-    mispriced = con.execute(
-        "SELECT COUNT(*) FROM products WHERE list_price < cost_price"
-    ).fetchone()[0]
     print(f"  Products with list < cost: {mispriced}")
-
-    dup_orders = con.execute(
-        "SELECT COUNT(*) - COUNT(DISTINCT order_id) FROM orders"
-    ).fetchone()[0]
     print(f"  Duplicate order rows: {dup_orders}")
 
-    funnel = con.execute("""
-        SELECT event_type, COUNT(*) as cnt
-        FROM events
-        GROUP BY event_type
-        ORDER BY cnt DESC
-    """).fetchall()
     print("\n  Funnel breakdown:")
     for event_type, cnt in funnel:
         print(f"    {event_type:20s}  {cnt:>8,}")
@@ -381,4 +541,6 @@ def load_data():
 
 
 if __name__ == "__main__":
-    load_data()
+    parser = argparse.ArgumentParser(description="Generate the demo DuckDB database.")
+    parser.add_argument("--force", action="store_true", help="regenerate even if the database is already loaded")
+    load_data(force=parser.parse_args().force)